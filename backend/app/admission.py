@@ -0,0 +1,134 @@
+import os
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Admission control configuration
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "64"))
+ADMISSION_MAX_LOOP_LAG_MS = float(os.getenv("ADMISSION_MAX_LOOP_LAG_MS", "250"))
+ADMISSION_MAX_POOL_WAIT_MS = float(os.getenv("ADMISSION_MAX_POOL_WAIT_MS", "1000"))
+ADMISSION_LOW_PRIORITY_SHARE = float(os.getenv("ADMISSION_LOW_PRIORITY_SHARE", "0.5"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2"))
+
+# Interval of the event-loop lag probe and smoothing of the signals
+LOOP_LAG_INTERVAL_SECONDS = 0.25
+EWMA_ALPHA = 0.3
+
+# Probes are never shed; signup/login are shed first
+PROBE_PATHS = {"/health", "/livez", "/readyz"}
+LOW_PRIORITY_PATHS = {"/auth/signup", "/auth/login"}
+
+
+class LoadMonitor:
+    """Tracks in-flight requests, event-loop lag and DB pool checkout wait."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.loop_lag_ms = 0.0
+        self.pool_wait_ms = 0.0
+        self.shed_count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start sampling event-loop lag on the running loop."""
+        self._task = asyncio.create_task(self._sample_loop_lag())
+
+    async def stop(self) -> None:
+        """Stop the event-loop lag sampler."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _sample_loop_lag(self) -> None:
+        """Measure how late the loop wakes a sleeping task."""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LOOP_LAG_INTERVAL_SECONDS)
+            lag_ms = max((time.perf_counter() - started - LOOP_LAG_INTERVAL_SECONDS) * 1000, 0.0)
+            self.loop_lag_ms += EWMA_ALPHA * (lag_ms - self.loop_lag_ms)
+            # Let the pool signal recover while shed requests produce no samples
+            self.pool_wait_ms *= 1 - EWMA_ALPHA
+
+    def observe_pool_wait(self, seconds: float) -> None:
+        """Record how long a request waited to check out a DB connection."""
+        self.pool_wait_ms += EWMA_ALPHA * (seconds * 1000 - self.pool_wait_ms)
+
+    def pressure(self) -> float:
+        """Return load as a fraction of capacity; 1.0 or more means saturated."""
+        return max(
+            self.in_flight / ADMISSION_MAX_IN_FLIGHT,
+            self.loop_lag_ms / ADMISSION_MAX_LOOP_LAG_MS,
+            self.pool_wait_ms / ADMISSION_MAX_POOL_WAIT_MS
+        )
+
+    def saturated(self) -> bool:
+        """Whether the worker should stop receiving traffic."""
+        return self.pressure() >= 1.0
+
+    def admit(self, high_priority: bool) -> bool:
+        """Decide whether a new request may start."""
+        limit = 1.0 if high_priority else ADMISSION_LOW_PRIORITY_SHARE
+        return self.pressure() < limit
+
+    def snapshot(self) -> dict:
+        """Return the current load signals."""
+        return {
+            "in_flight": self.in_flight,
+            "loop_lag_ms": round(self.loop_lag_ms, 1),
+            "pool_wait_ms": round(self.pool_wait_ms, 1),
+            "pressure": round(self.pressure(), 3),
+            "shed": self.shed_count
+        }
+
+
+# Global monitor for this worker
+load_monitor = LoadMonitor()
+
+
+def _is_high_priority(scope: Scope) -> bool:
+    """Authenticated requests outside signup/login get the full capacity."""
+    if scope["path"] in LOW_PRIORITY_PATHS:
+        return False
+    # Only the presence of a bearer token is checked here; a forged header
+    # merely moves a request into the high-priority class, which is still
+    # bounded by the hard limit, and the route rejects it afterwards.
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return value[:7].lower() == b"bearer "
+    return False
+
+
+class AdmissionControlMiddleware:
+    """Sheds load with 503 + Retry-After before requests reach the app."""
+
+    def __init__(self, app: ASGIApp, monitor: LoadMonitor = load_monitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in PROBE_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if not self.monitor.admit(_is_high_priority(scope)):
+            self.monitor.shed_count += 1
+            if self.monitor.shed_count % 100 == 1:
+                logging.warning(f"Shedding load: {self.monitor.snapshot()}")
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Service overloaded, please retry later"},
+                headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)}
+            )
+            await response(scope, receive, send)
+            return
+
+        self.monitor.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.in_flight -= 1
@@ -1,13 +1,16 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from .db import get_db
+from .db import get_db, SessionLocal
+from .jobs import job, enqueue
 from .models import User, RefreshToken
 from .schemas import UserCreate, UserOut, Token, TokenRefresh, MessageResponse
 from .security import (
@@ -18,7 +21,8 @@ from .security import (
     decode_token,
     get_current_user,
     authenticate_user,
-    ACCESS_TOKEN_EXPIRE_MINUTES
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_EXPIRE_DAYS
 )
 
 # Rate limiting setup
@@ -107,7 +111,7 @@ async def login(
     db_refresh_token = RefreshToken(
         user_id=user.id,
         token=refresh_token,
-        expires_at=datetime.utcnow() + timedelta(days=7)
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     )
     
     try:
@@ -118,6 +122,17 @@ async def login(
         logging.error(f"Failed to store refresh token: {e}")
         # Continue without refresh token if storage fails
     
+    # Sweep the user's dead refresh tokens in the background, at most once a day
+    try:
+        await asyncio.to_thread(
+            enqueue,
+            "auth.purge_refresh_tokens",
+            {"user_id": user.id},
+            idempotency_key=f"purge-refresh-tokens:{user.id}:{datetime.utcnow().date().isoformat()}"
+        )
+    except Exception as e:
+        logging.warning(f"Failed to enqueue refresh token purge: {e}")
+    
     return {
         "access_token": access_token,
         "token_type": "bearer",
@@ -126,6 +141,22 @@ async def login(
     }
 
 
+@job("auth.purge_refresh_tokens")
+def purge_refresh_tokens(payload: dict) -> None:
+    """Delete expired and revoked refresh tokens of a user."""
+    db = SessionLocal()
+    try:
+        deleted = db.query(RefreshToken).filter(
+            RefreshToken.user_id == payload["user_id"],
+            or_(RefreshToken.revoked == True, RefreshToken.expires_at <= datetime.utcnow())
+        ).delete(synchronize_session=False)
+        db.commit()
+        if deleted:
+            logging.info(f"Purged {deleted} refresh tokens for user {payload['user_id']}")
+    finally:
+        db.close()
+
+
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     token_data: TokenRefresh,
@@ -0,0 +1,185 @@
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .db import get_db, SessionLocal
+from .models import User, UserCounter, ChatMessage, Friendship
+from .schemas import BadgeCounts
+from .security import get_current_user
+
+# Create router
+router = APIRouter(prefix="/users/me", tags=["badges"])
+
+
+def _count_unread(db: Session, user_id: int) -> int:
+    """Count unread messages for a user directly from the messages table."""
+    return db.query(func.count(ChatMessage.id)).filter(
+        ChatMessage.receiver_id == user_id,
+        ChatMessage.is_read == False
+    ).scalar() or 0
+
+
+def _count_pending(db: Session, user_id: int) -> int:
+    """Count pending friend requests addressed to a user."""
+    return db.query(func.count(Friendship.id)).filter(
+        Friendship.addressee_id == user_id,
+        Friendship.status == "pending"
+    ).scalar() or 0
+
+
+def _seed_counter(db: Session, user_id: int) -> bool:
+    """Create the counter row for a user from the live tables.
+
+    Returns False if another transaction created the row first.
+    """
+    try:
+        with db.begin_nested():
+            db.add(UserCounter(
+                user_id=user_id,
+                unread_messages=_count_unread(db, user_id),
+                pending_friend_requests=_count_pending(db, user_id)
+            ))
+    except IntegrityError:
+        return False
+    return True
+
+
+def _apply_deltas(db: Session, user_id: int, unread_messages: int, pending_friend_requests: int) -> int:
+    """Add deltas to a user's counter row, returning the number of rows updated."""
+    return db.execute(
+        update(UserCounter)
+        .where(UserCounter.user_id == user_id)
+        .values(
+            unread_messages=UserCounter.unread_messages + unread_messages,
+            pending_friend_requests=UserCounter.pending_friend_requests + pending_friend_requests
+        )
+    ).rowcount
+
+
+def adjust_counters(
+    db: Session,
+    user_id: int,
+    unread_messages: int = 0,
+    pending_friend_requests: int = 0
+) -> None:
+    """Apply counter deltas for a user inside the caller's transaction.
+
+    Must be called after the change itself has been added to the session.
+    If the user has no counter row yet it is seeded from the live tables,
+    which already include the change, so the delta is not applied twice.
+    If a concurrent transaction seeds the row first, its counts cannot see
+    this uncommitted change, so the delta is applied to its row instead.
+    """
+    db.flush()
+    if _apply_deltas(db, user_id, unread_messages, pending_friend_requests) == 0:
+        if not _seed_counter(db, user_id):
+            _apply_deltas(db, user_id, unread_messages, pending_friend_requests)
+
+
+def _repair_counter(db: Session, user_id: int) -> bool:
+    """Recompute one user's counters in a short transaction.
+
+    The counter row is written before counting, so writers that change the
+    live tables concurrently wait for this transaction and then apply their
+    delta on top of the corrected value. Returns True if the row was
+    created or corrected.
+    """
+    try:
+        lock = update(UserCounter).where(UserCounter.user_id == user_id).values(updated_at=datetime.utcnow())
+        if db.execute(lock).rowcount == 0:
+            if _seed_counter(db, user_id):
+                db.commit()
+                return True
+            db.execute(lock)
+
+        counter = db.get(UserCounter, user_id, populate_existing=True)
+        expected_unread = _count_unread(db, user_id)
+        expected_pending = _count_pending(db, user_id)
+        repaired = (counter.unread_messages != expected_unread
+                    or counter.pending_friend_requests != expected_pending)
+        if repaired:
+            logging.warning(
+                f"Counter drift for user {user_id}: unread {counter.unread_messages}->{expected_unread}, "
+                f"pending {counter.pending_friend_requests}->{expected_pending}"
+            )
+            counter.unread_messages = expected_unread
+            counter.pending_friend_requests = expected_pending
+        db.commit()
+        return repaired
+    except Exception:
+        db.rollback()
+        raise
+
+
+def reconcile_counters(db: Session, user_id: Optional[int] = None) -> int:
+    """Recompute counters from the live tables and repair drifted rows.
+
+    A grouped snapshot finds candidate users cheaply; each candidate is then
+    rechecked and repaired in its own short transaction, so increments made
+    while the reconciliation runs are not overwritten.
+    Returns the number of counter rows that were created or corrected.
+    """
+    unread_query = db.query(ChatMessage.receiver_id, func.count(ChatMessage.id)).filter(
+        ChatMessage.is_read == False
+    )
+    pending_query = db.query(Friendship.addressee_id, func.count(Friendship.id)).filter(
+        Friendship.status == "pending"
+    )
+    user_query = db.query(User.id)
+    if user_id is not None:
+        unread_query = unread_query.filter(ChatMessage.receiver_id == user_id)
+        pending_query = pending_query.filter(Friendship.addressee_id == user_id)
+        user_query = user_query.filter(User.id == user_id)
+
+    unread: Dict[int, int] = dict(unread_query.group_by(ChatMessage.receiver_id).all())
+    pending: Dict[int, int] = dict(pending_query.group_by(Friendship.addressee_id).all())
+    existing = {
+        uid: (unread_messages, pending_friend_requests)
+        for uid, unread_messages, pending_friend_requests in db.query(
+            UserCounter.user_id, UserCounter.unread_messages, UserCounter.pending_friend_requests
+        ).filter(UserCounter.user_id.in_(user_query.scalar_subquery()))
+    }
+    candidates = [
+        uid for (uid,) in user_query.all()
+        if existing.get(uid) != (unread.get(uid, 0), pending.get(uid, 0))
+    ]
+    db.commit()
+
+    return sum(_repair_counter(db, uid) for uid in candidates)
+
+
+@router.get("/badges", response_model=BadgeCounts)
+async def get_badges(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get unread message and pending friend request counts for the app badge."""
+    counter = db.get(UserCounter, current_user.id)
+    if counter is None:
+        _seed_counter(db, current_user.id)
+        db.commit()
+        counter = db.get(UserCounter, current_user.id)
+    return BadgeCounts(
+        unread_messages=max(counter.unread_messages, 0),
+        pending_friend_requests=max(counter.pending_friend_requests, 0)
+    )
+
+
+def main() -> None:
+    """Reconcile all badge counters (python -m app.counters)."""
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        repaired = reconcile_counters(db)
+        logging.info(f"Counter reconciliation finished, {repaired} rows repaired")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 import os
+import time
 import logging
 from sqlalchemy import create_engine, Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 
+from .admission import load_monitor
+
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL")
 
@@ -52,6 +55,10 @@ def get_db() -> Generator[Session, None, None]:
     """FastAPI dependency to get database session."""
     db = SessionLocal()
     try:
+        # Check out the connection eagerly to measure pool wait for admission control
+        started = time.perf_counter()
+        db.connection()
+        load_monitor.observe_pool_wait(time.perf_counter() - started)
         yield db
     finally:
         db.close()
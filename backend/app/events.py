@@ -0,0 +1,176 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .db import get_db
+from .feed import record_activity
+from .images import ingest_image, image_url
+from .models import User, Event, EventAttendee
+from .schemas import EventCreate, EventOut, EventAttendeeCreate, EventAttendeeOut
+from .security import get_current_user
+
+# Valid RSVP statuses
+RSVP_STATUSES = {"attending", "maybe", "declined"}
+
+# Create router
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def _attendee_count(db: Session, event_id: int) -> int:
+    """Count users attending an event."""
+    return db.query(func.count(EventAttendee.id)).filter(
+        EventAttendee.event_id == event_id,
+        EventAttendee.status == "attending"
+    ).scalar() or 0
+
+
+def _event_out(db: Session, event: Event, user: User) -> EventOut:
+    """Build the event response including attendance information."""
+    is_attending = db.query(EventAttendee.id).filter(
+        EventAttendee.event_id == event.id,
+        EventAttendee.user_id == user.id,
+        EventAttendee.status == "attending"
+    ).first() is not None
+    return EventOut.model_validate(event).model_copy(update={
+        "attendee_count": _attendee_count(db, event.id),
+        "is_attending": is_attending
+    })
+
+
+@router.post("/", response_model=EventOut, status_code=status.HTTP_201_CREATED)
+async def create_event(
+    event_data: EventCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create a new event."""
+    event = Event(**event_data.model_dump(), creator_id=current_user.id)
+
+    try:
+        db.add(event)
+        db.flush()
+        if event.is_public:
+            record_activity(db, current_user.id, "event_created", event.id)
+        db.commit()
+        db.refresh(event)
+        logging.info(f"Event {event.id} created by user {current_user.id}")
+        return _event_out(db, event, current_user)
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Failed to create event: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create event"
+        )
+
+
+@router.get("/{event_id}", response_model=EventOut)
+async def get_event(
+    event_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get a single event."""
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event or (not event.is_public and event.creator_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    return _event_out(db, event, current_user)
+
+
+@router.post("/{event_id}/rsvp", response_model=EventAttendeeOut)
+async def rsvp_event(
+    event_id: int,
+    rsvp_data: EventAttendeeCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Attend, maybe-attend or decline an event."""
+    if rsvp_data.status not in RSVP_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid RSVP status"
+        )
+
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event or (not event.is_public and event.creator_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    attendee = db.query(EventAttendee).filter(
+        EventAttendee.event_id == event_id,
+        EventAttendee.user_id == current_user.id
+    ).first()
+    previous_status = attendee.status if attendee else None
+    if previous_status == rsvp_data.status:
+        return attendee
+
+    if rsvp_data.status == "attending" and _attendee_count(db, event_id) >= event.max_attendees:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Event is full"
+        )
+
+    try:
+        if attendee:
+            attendee.status = rsvp_data.status
+        else:
+            attendee = EventAttendee(
+                event_id=event_id,
+                user_id=current_user.id,
+                status=rsvp_data.status
+            )
+            db.add(attendee)
+        db.flush()
+        if event.is_public and rsvp_data.status != "declined":
+            record_activity(db, current_user.id, "rsvp", event_id)
+        db.commit()
+        db.refresh(attendee)
+        return attendee
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Failed to RSVP for event {event_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to RSVP for event"
+        )
+
+
+@router.post("/{event_id}/image", response_model=EventOut)
+async def upload_event_image(
+    event_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Upload a new image for an event created by the current user."""
+    event = db.query(Event).filter(
+        Event.id == event_id,
+        Event.creator_id == current_user.id
+    ).first()
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    upload = await ingest_image(request, db)
+    try:
+        event = db.get(Event, event_id)
+        event.image_url = image_url(upload.hash)
+        db.commit()
+        db.refresh(event)
+        return _event_out(db, event, current_user)
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Failed to update event image: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update event image"
+        )
@@ -0,0 +1,85 @@
+import json
+import logging
+from datetime import datetime
+from typing import Iterator
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_, select
+
+from .db import SessionLocal
+from .models import User, Event, EventAttendee, Friendship, ChatMessage
+from .security import get_current_user
+
+# Rows fetched per round trip while streaming the export
+EXPORT_BATCH_SIZE = 500
+
+# Columns that must never leave the server
+EXCLUDED_COLUMNS = {"hashed_password"}
+
+# Create router
+router = APIRouter(prefix="/users/me", tags=["export"])
+
+
+def _json_default(value):
+    """Serialize values the json module cannot handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _ndjson_line(record_type: str, data: dict) -> bytes:
+    """Encode a single export record as one NDJSON line."""
+    record = {"type": record_type, "data": data}
+    return (json.dumps(record, default=_json_default) + "\n").encode("utf-8")
+
+
+def _stream_rows(db, record_type: str, model, *criteria) -> Iterator[bytes]:
+    """Stream the rows of a table matching criteria using a server-side cursor."""
+    columns = [c for c in model.__table__.columns if c.name not in EXCLUDED_COLUMNS]
+    stmt = (
+        select(*columns)
+        .where(*criteria)
+        .order_by(model.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    # Core rows are not tracked in the session identity map, so only the
+    # current batch is held in memory regardless of how many rows match.
+    for row in db.execute(stmt):
+        yield _ndjson_line(record_type, dict(row._mapping))
+
+
+def export_user_data(user_id: int) -> Iterator[bytes]:
+    """Yield all data stored for a user as NDJSON lines."""
+    db = SessionLocal()
+    try:
+        yield from _stream_rows(db, "profile", User, User.id == user_id)
+        yield from _stream_rows(db, "event", Event, Event.creator_id == user_id)
+        yield from _stream_rows(db, "attendance", EventAttendee, EventAttendee.user_id == user_id)
+        yield from _stream_rows(
+            db, "friendship", Friendship,
+            or_(Friendship.requester_id == user_id, Friendship.addressee_id == user_id)
+        )
+        yield from _stream_rows(
+            db, "message", ChatMessage,
+            or_(ChatMessage.sender_id == user_id, ChatMessage.receiver_id == user_id)
+        )
+        logging.info(f"Data export completed for user: {user_id}")
+    except Exception as e:
+        logging.error(f"Data export failed for user {user_id}: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@router.get("/export")
+async def export_my_data(current_user: User = Depends(get_current_user)):
+    """Export all data of the current user as a streamed NDJSON document."""
+    # The generator is synchronous, so Starlette iterates it in the threadpool
+    # and the blocking database reads never run on the event loop.
+    filename = f"getout-export-{current_user.id}.ndjson"
+    return StreamingResponse(
+        export_user_data(current_user.id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,107 @@
+import os
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from .db import get_db
+from .friends import accepted_friend_ids
+from .models import User, Activity, FeedItem
+from .schemas import FeedItemOut, FeedPage
+from .security import get_current_user
+
+# Feed configuration
+FEED_MAX_ITEMS = int(os.getenv("FEED_MAX_ITEMS", "500"))
+FEED_FANOUT_MAX_FRIENDS = int(os.getenv("FEED_FANOUT_MAX_FRIENDS", "1000"))
+FEED_TRIM_EVERY = int(os.getenv("FEED_TRIM_EVERY", "50"))
+
+# Create router
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+
+def _trim_feeds(db: Session, owner_ids: List[int]) -> None:
+    """Delete feed entries beyond FEED_MAX_ITEMS for the given owners."""
+    ranked = select(
+        FeedItem.id,
+        func.row_number().over(
+            partition_by=FeedItem.owner_id,
+            order_by=FeedItem.activity_id.desc()
+        ).label("rank")
+    ).where(FeedItem.owner_id.in_(owner_ids)).subquery()
+    overflow = select(ranked.c.id).where(ranked.c.rank > FEED_MAX_ITEMS)
+    db.execute(delete(FeedItem).where(FeedItem.id.in_(overflow)))
+
+
+def record_activity(db: Session, actor_id: int, verb: str, event_id: int) -> Activity:
+    """Record an activity and fan it out to the actor's accepted friends.
+
+    Runs inside the caller's transaction. Actors with more than
+    FEED_FANOUT_MAX_FRIENDS friends are not fanned out; their activities
+    are pulled by readers instead.
+    """
+    friend_ids = accepted_friend_ids(db, actor_id)
+    fan_out = len(friend_ids) <= FEED_FANOUT_MAX_FRIENDS
+
+    activity = Activity(actor_id=actor_id, verb=verb, event_id=event_id, fanned_out=fan_out)
+    db.add(activity)
+    db.flush()
+
+    if fan_out and friend_ids:
+        db.execute(
+            insert(FeedItem),
+            [{"owner_id": owner_id, "activity_id": activity.id} for owner_id in friend_ids]
+        )
+        # Trimming scans the recipients' feeds, so it is amortized over writes
+        if activity.id % FEED_TRIM_EVERY == 0:
+            _trim_feeds(db, friend_ids)
+
+    return activity
+
+
+def read_feed(db: Session, user_id: int, before_id: Optional[int], limit: int) -> List[Activity]:
+    """Return the newest activities of a user's friends, older than before_id."""
+    # Feed entries are not removed when a friendship ends, so both branches
+    # only return activities of current friends
+    friend_ids = accepted_friend_ids(db, user_id)
+    if not friend_ids:
+        return []
+
+    # Activities fanned out on write
+    pushed = db.query(Activity).join(FeedItem, FeedItem.activity_id == Activity.id).filter(
+        FeedItem.owner_id == user_id,
+        Activity.actor_id.in_(friend_ids)
+    )
+    if before_id is not None:
+        pushed = pushed.filter(FeedItem.activity_id < before_id)
+    items = pushed.order_by(FeedItem.activity_id.desc()).limit(limit).all()
+
+    # Activities of high-degree friends, fanned out on read
+    pulled = db.query(Activity).filter(
+        Activity.fanned_out == False,
+        Activity.actor_id.in_(friend_ids)
+    )
+    if before_id is not None:
+        pulled = pulled.filter(Activity.id < before_id)
+    items.extend(pulled.order_by(Activity.id.desc()).limit(limit).all())
+
+    items.sort(key=lambda activity: activity.id, reverse=True)
+    return items[:limit]
+
+
+@router.get("/", response_model=FeedPage)
+async def get_feed(
+    before_id: Optional[int] = Query(None, description="Return activities older than this id"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get a page of recent activity from the current user's friends."""
+    items = read_feed(db, current_user.id, before_id, limit)
+    next_before_id = items[-1].id if len(items) == limit else None
+    logging.debug(f"Feed page for user {current_user.id}: {len(items)} items")
+    return FeedPage(
+        items=[FeedItemOut.model_validate(item) for item in items],
+        next_before_id=next_before_id
+    )
@@ -0,0 +1,181 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from .db import SessionLocal
+from .models import Friendship
+
+# Friend graph configuration
+FRIEND_GRAPH_SYNC_SECONDS = float(os.getenv("FRIEND_GRAPH_SYNC_SECONDS", "10"))
+
+# Changes are re-read with this overlap so rows committed late are not missed;
+# applying a change twice is harmless because edges are set from current status
+SYNC_OVERLAP = timedelta(seconds=60)
+
+EMPTY = np.empty(0, dtype=np.int32)
+
+
+class FriendGraph:
+    """In-memory adjacency index of accepted friendships.
+
+    Each user maps to a sorted int32 array of friend ids. The index is built
+    from the friendships table at startup; local changes are applied directly
+    and changes made by other workers are picked up by a periodic sync.
+    """
+
+    def __init__(self):
+        self._adjacency: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._watermark: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self.ready = False
+
+    def build(self) -> None:
+        """Load all accepted friendships into the index."""
+        started = time.perf_counter()
+        sync_started = datetime.utcnow()
+        chunks = []
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                select(Friendship.requester_id, Friendship.addressee_id)
+                .where(Friendship.status == "accepted")
+                .execution_options(yield_per=50000)
+            )
+            for partition in result.partitions():
+                # fromiter avoids numpy's slow generic path for sequences of Row objects
+                flat = np.fromiter(
+                    (value for row in partition for value in row),
+                    dtype=np.int32,
+                    count=2 * len(partition)
+                )
+                chunks.append(flat.reshape(-1, 2))
+        finally:
+            db.close()
+        edges = np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.int32)
+
+        # Store every edge in both directions, grouped by user and sorted
+        sources = np.concatenate([edges[:, 0], edges[:, 1]])
+        targets = np.concatenate([edges[:, 1], edges[:, 0]])
+        order = np.lexsort((targets, sources))
+        sources, targets = sources[order], targets[order]
+        if len(sources):
+            distinct = np.ones(len(sources), dtype=bool)
+            distinct[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+            sources, targets = sources[distinct], targets[distinct]
+        users, starts = np.unique(sources, return_index=True)
+        adjacency = dict(zip(users.tolist(), np.split(targets, starts[1:])))
+
+        with self._lock:
+            self._adjacency = adjacency
+            self._watermark = sync_started - SYNC_OVERLAP
+            self.ready = True
+        logging.info(
+            f"Friend graph built: {len(adjacency)} users, {len(targets) // 2} friendships "
+            f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+    def sync(self) -> None:
+        """Apply friendship changes made since the last build or sync."""
+        if self._watermark is None:
+            return
+        sync_started = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                Friendship.requester_id, Friendship.addressee_id, Friendship.status
+            ).filter(Friendship.updated_at >= self._watermark).all()
+        finally:
+            db.close()
+        for requester_id, addressee_id, status in rows:
+            if status == "accepted":
+                self.add_edge(requester_id, addressee_id)
+            else:
+                self.remove_edge(requester_id, addressee_id)
+        self._watermark = sync_started - SYNC_OVERLAP
+
+    def _set(self, user_id: int, friend_id: int, present: bool) -> None:
+        """Insert or delete friend_id in a user's sorted array (lock held)."""
+        friends = self._adjacency.get(user_id, EMPTY)
+        i = int(np.searchsorted(friends, friend_id))
+        exists = i < len(friends) and friends[i] == friend_id
+        if present and not exists:
+            self._adjacency[user_id] = np.insert(friends, i, friend_id).astype(np.int32, copy=False)
+        elif not present and exists:
+            self._adjacency[user_id] = np.delete(friends, i)
+
+    def add_edge(self, a: int, b: int) -> None:
+        """Record an accepted friendship between two users."""
+        with self._lock:
+            self._set(a, b, True)
+            self._set(b, a, True)
+
+    def remove_edge(self, a: int, b: int) -> None:
+        """Remove a friendship between two users."""
+        with self._lock:
+            self._set(a, b, False)
+            self._set(b, a, False)
+
+    def friends(self, user_id: int) -> np.ndarray:
+        """Return the sorted friend ids of a user."""
+        return self._adjacency.get(user_id, EMPTY)
+
+    def mutual_count(self, a: int, b: int) -> int:
+        """Count friends two users have in common."""
+        return len(np.intersect1d(self.friends(a), self.friends(b), assume_unique=True))
+
+    def suggestions(self, user_id: int, limit: int, exclude: Optional[List[int]] = None) -> List[Tuple[int, int]]:
+        """Rank friends-of-friends by number of mutual friends.
+
+        Returns (user_id, mutual_count) pairs, ties broken by lower user id.
+        """
+        friends = self.friends(user_id)
+        if len(friends) == 0:
+            return []
+        candidates, counts = np.unique(
+            np.concatenate([self.friends(int(f)) for f in friends]),
+            return_counts=True
+        )
+        keep = ~np.isin(candidates, friends, assume_unique=True) & (candidates != user_id)
+        if exclude:
+            keep &= ~np.isin(candidates, np.asarray(exclude, dtype=np.int32))
+        candidates, counts = candidates[keep], counts[keep]
+        top = np.argsort(-counts, kind="stable")[:limit]
+        return [(int(candidates[i]), int(counts[i])) for i in top]
+
+    async def start(self) -> None:
+        """Build the index off the event loop and start the periodic sync."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic sync."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        """Build once, then keep the index current."""
+        while not self.ready:
+            try:
+                await asyncio.to_thread(self.build)
+            except Exception as e:
+                logging.error(f"Friend graph build failed: {e}")
+                await asyncio.sleep(FRIEND_GRAPH_SYNC_SECONDS)
+        while True:
+            await asyncio.sleep(FRIEND_GRAPH_SYNC_SECONDS)
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception as e:
+                logging.error(f"Friend graph sync failed: {e}")
+
+
+# Global friend graph for this worker
+friend_graph = FriendGraph()
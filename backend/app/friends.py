@@ -0,0 +1,215 @@
+import logging
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from .counters import adjust_counters
+from .db import get_db
+from .friend_graph import friend_graph
+from .models import User, Friendship
+from .schemas import (
+    FriendshipCreate,
+    FriendshipUpdate,
+    FriendshipOut,
+    MutualFriendsOut,
+    FriendSuggestionOut
+)
+from .security import get_current_user
+
+# Statuses an addressee may answer a friend request with
+RESPONSE_STATUSES = {"accepted", "declined", "blocked"}
+
+# Create router
+router = APIRouter(prefix="/friends", tags=["friends"])
+
+
+def accepted_friend_ids(db: Session, user_id: int) -> List[int]:
+    """Return the ids of all users with an accepted friendship to user_id."""
+    as_requester = db.query(Friendship.addressee_id).filter(
+        Friendship.requester_id == user_id,
+        Friendship.status == "accepted"
+    )
+    as_addressee = db.query(Friendship.requester_id).filter(
+        Friendship.addressee_id == user_id,
+        Friendship.status == "accepted"
+    )
+    return [row[0] for row in as_requester.union_all(as_addressee)]
+
+
+@router.post("/requests", response_model=FriendshipOut, status_code=status.HTTP_201_CREATED)
+async def send_friend_request(
+    request_data: FriendshipCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Send a friend request to another user."""
+    if request_data.addressee_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot send a friend request to yourself"
+        )
+
+    addressee = db.query(User).filter(User.id == request_data.addressee_id).first()
+    if not addressee or not addressee.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    # Check for an existing friendship in either direction
+    existing = db.query(Friendship).filter(
+        or_(
+            and_(Friendship.requester_id == current_user.id,
+                 Friendship.addressee_id == addressee.id),
+            and_(Friendship.requester_id == addressee.id,
+                 Friendship.addressee_id == current_user.id)
+        )
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Friendship already exists"
+        )
+
+    friendship = Friendship(
+        requester_id=current_user.id,
+        addressee_id=addressee.id,
+        status="pending"
+    )
+
+    try:
+        db.add(friendship)
+        adjust_counters(db, addressee.id, pending_friend_requests=1)
+        db.commit()
+        db.refresh(friendship)
+        logging.info(f"Friend request sent: {current_user.id} -> {addressee.id}")
+        return friendship
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Failed to create friend request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create friend request"
+        )
+
+
+@router.get("/requests", response_model=List[FriendshipOut])
+async def list_pending_requests(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """List pending friend requests addressed to the current user."""
+    return db.query(Friendship).filter(
+        Friendship.addressee_id == current_user.id,
+        Friendship.status == "pending"
+    ).order_by(Friendship.created_at.desc()).all()
+
+
+@router.put("/requests/{friendship_id}", response_model=FriendshipOut)
+async def respond_to_friend_request(
+    friendship_id: int,
+    response_data: FriendshipUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Accept, decline or block a friend request addressed to the current user."""
+    if response_data.status not in RESPONSE_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid friendship status"
+        )
+
+    friendship = db.query(Friendship).filter(
+        Friendship.id == friendship_id,
+        Friendship.addressee_id == current_user.id
+    ).first()
+    if not friendship:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Friend request not found"
+        )
+
+    previous_status = friendship.status
+
+    try:
+        # Only one of several concurrent responses can move the row out of
+        # the status read above, so counters and the graph change once
+        transitioned = db.execute(
+            update(Friendship)
+            .where(Friendship.id == friendship_id, Friendship.status == previous_status)
+            .values(status=response_data.status)
+        ).rowcount == 1
+        if transitioned and previous_status == "pending":
+            adjust_counters(db, current_user.id, pending_friend_requests=-1)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Failed to update friend request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update friend request"
+        )
+
+    if not transitioned:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Friend request was changed concurrently"
+        )
+
+    db.refresh(friendship)
+    if response_data.status == "accepted":
+        friend_graph.add_edge(friendship.requester_id, friendship.addressee_id)
+    elif previous_status == "accepted":
+        friend_graph.remove_edge(friendship.requester_id, friendship.addressee_id)
+    logging.info(f"Friend request {friendship_id} {response_data.status} by user {current_user.id}")
+    return friendship
+
+
+def _require_graph() -> None:
+    """Fail fast while the friend graph is still being built."""
+    if not friend_graph.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Friend graph is loading",
+            headers={"Retry-After": "5"}
+        )
+
+
+@router.get("/suggestions", response_model=List[FriendSuggestionOut])
+async def get_friend_suggestions(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Suggest friends-of-friends ranked by number of mutual friends."""
+    _require_graph()
+    # Users with a pending, declined or blocked request are not suggested
+    exclude = [
+        other_id for requester_id, addressee_id in db.query(
+            Friendship.requester_id, Friendship.addressee_id
+        ).filter(
+            or_(Friendship.requester_id == current_user.id,
+                Friendship.addressee_id == current_user.id),
+            Friendship.status != "accepted"
+        )
+        for other_id in (requester_id, addressee_id) if other_id != current_user.id
+    ]
+    return [
+        FriendSuggestionOut(user_id=user_id, mutual_count=mutual_count)
+        for user_id, mutual_count in friend_graph.suggestions(current_user.id, limit, exclude)
+    ]
+
+
+@router.get("/{user_id}/mutual", response_model=MutualFriendsOut)
+async def get_mutual_friends(
+    user_id: int,
+    current_user: User = Depends(get_current_user)
+):
+    """Get the number of mutual friends with another user."""
+    _require_graph()
+    return MutualFriendsOut(
+        user_id=user_id,
+        mutual_count=friend_graph.mutual_count(current_user.id, user_id)
+    )
@@ -0,0 +1,221 @@
+import os
+import re
+import asyncio
+import hashlib
+import logging
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from .db import get_db
+from .models import User
+from .schemas import ImageUploadOut, UserOut
+from .security import get_current_user
+from .thumbnails import make_thumbnails, thumbnail_path
+
+# Image pipeline configuration
+IMAGE_STORAGE_DIR = os.getenv("IMAGE_STORAGE_DIR", "/home/site/images")
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+IMAGE_SIZES = sorted(int(size) for size in os.getenv("IMAGE_SIZES", "128,512,1024").split(","))
+IMAGE_DEFAULT_SIZE = int(os.getenv("IMAGE_DEFAULT_SIZE", "512"))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+# Links must point at a size that is actually generated
+if IMAGE_DEFAULT_SIZE not in IMAGE_SIZES:
+    fallback = min(IMAGE_SIZES, key=lambda size: (abs(size - IMAGE_DEFAULT_SIZE), size))
+    logging.warning(f"IMAGE_DEFAULT_SIZE {IMAGE_DEFAULT_SIZE} is not in IMAGE_SIZES, using {fallback}")
+    IMAGE_DEFAULT_SIZE = fallback
+
+ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# Thumbnails never change for a given hash
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Create router
+router = APIRouter(tags=["images"])
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the process pool used for decoding and resizing."""
+    global _executor
+    if _executor is None:
+        # spawn avoids forking a process that is running threads and an event loop
+        _executor = ProcessPoolExecutor(
+            max_workers=IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def shutdown_image_workers() -> None:
+    """Shut down the thumbnailing process pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def image_url(digest: str, size: int = IMAGE_DEFAULT_SIZE) -> str:
+    """Return the URL of a stored thumbnail."""
+    return f"/images/{digest}/{size}"
+
+
+def _write_chunk(file, hasher, chunk: bytes) -> None:
+    """Hash and write a chunk of the upload."""
+    hasher.update(chunk)
+    file.write(chunk)
+
+
+def _remove(path: str) -> None:
+    """Remove a file if it still exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def _receive_upload(request: Request) -> tuple:
+    """Stream the request body to a temporary file, returning (path, sha256)."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Unsupported image type"
+        )
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > IMAGE_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Image too large"
+        )
+
+    upload_dir = os.path.join(IMAGE_STORAGE_DIR, "uploads")
+    await asyncio.to_thread(os.makedirs, upload_dir, exist_ok=True)
+    file = await asyncio.to_thread(tempfile.NamedTemporaryFile, dir=upload_dir, delete=False)
+    hasher = hashlib.sha256()
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > IMAGE_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Image too large"
+                )
+            if chunk:
+                await asyncio.to_thread(_write_chunk, file, hasher, chunk)
+        await asyncio.to_thread(file.close)
+    except BaseException:
+        await asyncio.to_thread(file.close)
+        await asyncio.to_thread(_remove, file.name)
+        raise
+
+    if received == 0:
+        await asyncio.to_thread(_remove, file.name)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty upload"
+        )
+    return file.name, hasher.hexdigest()
+
+
+def _all_stored(digest: str) -> bool:
+    """Whether every thumbnail size for a hash already exists."""
+    return all(os.path.exists(thumbnail_path(IMAGE_STORAGE_DIR, digest, size)) for size in IMAGE_SIZES)
+
+
+async def ingest_image(request: Request, db: Session) -> ImageUploadOut:
+    """Store an uploaded image and its thumbnails, deduplicated by content hash.
+
+    Closes db first so its pooled connection is not held while a slow client
+    uploads and thumbnails are generated; the session reconnects on next use.
+    """
+    db.close()
+    upload_path, digest = await _receive_upload(request)
+    try:
+        if await asyncio.to_thread(_all_stored, digest):
+            logging.info(f"Image {digest} already stored, skipping processing")
+        else:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                _get_executor(), make_thumbnails, upload_path, IMAGE_STORAGE_DIR, digest, IMAGE_SIZES
+            )
+    except (OSError, ValueError) as e:
+        # Pillow raises UnidentifiedImageError (an OSError) for undecodable data
+        logging.warning(f"Rejected image upload: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid image"
+        )
+    finally:
+        await asyncio.to_thread(_remove, upload_path)
+
+    return ImageUploadOut(
+        hash=digest,
+        urls={str(size): image_url(digest, size) for size in IMAGE_SIZES}
+    )
+
+
+@router.post("/images", response_model=ImageUploadOut, status_code=status.HTTP_201_CREATED)
+async def upload_image(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Upload an image as the raw request body and get its thumbnail URLs."""
+    return await ingest_image(request, db)
+
+
+@router.get("/images/{digest}/{size}")
+async def get_image(digest: str, size: int, request: Request):
+    """Serve a stored thumbnail with long-lived cache headers."""
+    if not DIGEST_PATTERN.match(digest) or size not in IMAGE_SIZES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+
+    etag = f'"{digest}-{size}"'
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    path = thumbnail_path(IMAGE_STORAGE_DIR, digest, size)
+    if not await asyncio.to_thread(os.path.exists, path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+    return FileResponse(path, media_type="image/jpeg", headers=headers)
+
+
+@router.post("/users/me/profile-image", response_model=UserOut)
+async def upload_profile_image(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Upload a new profile image for the current user."""
+    user_id = current_user.id
+    upload = await ingest_image(request, db)
+    try:
+        user = db.get(User, user_id)
+        user.profile_image_url = image_url(upload.hash)
+        db.commit()
+        db.refresh(user)
+        return user
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Failed to update profile image: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update profile image"
+        )
@@ -0,0 +1,370 @@
+import os
+import json
+import random
+import socket
+import tempfile
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, Index,
+    create_engine, event, func, update, delete, or_, and_
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+from .schemas import JobQueueStats
+from .security import require_roles
+
+# Job queue configuration
+# The queue file must be on instance-local disk: /home on App Service is a
+# network share used by all instances, and SQLite's WAL mode relies on shared
+# memory that is unsafe on network filesystems. /tmp is local to the instance.
+JOB_QUEUE_URL = os.getenv(
+    "JOB_QUEUE_URL",
+    f"sqlite:///{os.path.join(tempfile.gettempdir(), 'getout-jobs.db')}"
+)
+JOB_QUEUE_ENABLED = os.getenv("JOB_QUEUE_ENABLED", "true").lower() == "true"
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "4"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_BACKOFF_BASE_SECONDS = float(os.getenv("JOB_BACKOFF_BASE_SECONDS", "2.0"))
+JOB_BACKOFF_MAX_SECONDS = float(os.getenv("JOB_BACKOFF_MAX_SECONDS", "300"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_RETENTION_HOURS = int(os.getenv("JOB_RETENTION_HOURS", "24"))
+
+# Jobs live in their own local SQLite file, separate from the main database
+JobBase = declarative_base()
+
+
+class Job(JobBase):
+    """Background job persisted in the local queue database."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False, default="{}")
+    idempotency_key = Column(String(255), unique=True)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=JOB_MAX_ATTEMPTS)
+    last_error = Column(Text)
+    locked_by = Column(String(100))
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        Index('ix_jobs_claim', 'status', 'run_after'),
+    )
+
+
+job_engine = create_engine(
+    JOB_QUEUE_URL,
+    connect_args={"check_same_thread": False, "timeout": 30},
+    echo=False
+)
+
+
+@event.listens_for(job_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL so gunicorn workers can enqueue and claim concurrently."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+JobSession = sessionmaker(autocommit=False, autoflush=False, bind=job_engine)
+
+_handlers: Dict[str, Callable[[dict], Any]] = {}
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+
+def _ensure_schema() -> None:
+    """Create the jobs table on first use."""
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if not _schema_ready:
+            JobBase.metadata.create_all(bind=job_engine)
+            _schema_ready = True
+
+
+def job(name: str):
+    """Register a function as the handler for jobs with the given name.
+
+    Handlers receive the JSON payload as a dict. Jobs are delivered at least
+    once, so handlers must be safe to run again after a crash or retry.
+    Plain functions run in a worker thread, coroutine functions on the loop.
+    """
+    def decorator(func: Callable[[dict], Any]) -> Callable[[dict], Any]:
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def enqueue(
+    name: str,
+    payload: Optional[dict] = None,
+    idempotency_key: Optional[str] = None,
+    delay_seconds: float = 0,
+    max_attempts: int = JOB_MAX_ATTEMPTS
+) -> Optional[int]:
+    """Add a job to the queue and return its id.
+
+    If a job with the same idempotency key already exists, its id is
+    returned and nothing new is enqueued. With JOB_QUEUE_ENABLED=false no
+    consumer would ever run or purge the job, so nothing is stored and None
+    is returned. This is a blocking SQLite write
+    that may wait on the busy timeout, so async route handlers should call
+    it through asyncio.to_thread.
+    """
+    if not JOB_QUEUE_ENABLED:
+        return None
+    _ensure_schema()
+    db = JobSession()
+    try:
+        new_job = Job(
+            name=name,
+            payload=json.dumps(payload or {}),
+            idempotency_key=idempotency_key,
+            max_attempts=max_attempts,
+            run_after=datetime.utcnow() + timedelta(seconds=delay_seconds)
+        )
+        db.add(new_job)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            existing = db.query(Job.id).filter(Job.idempotency_key == idempotency_key).first()
+            if existing is None:
+                raise
+            return existing.id
+        job_queue.notify()
+        return new_job.id
+    finally:
+        db.close()
+
+
+def _percentile(samples: Deque[float], fraction: float) -> float:
+    """Return the given percentile of samples, or 0 if there are none."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class JobQueue:
+    """Per-worker asyncio consumers for the local job queue."""
+
+    def __init__(self, concurrency: int = JOB_CONCURRENCY, poll_interval: float = JOB_POLL_INTERVAL_SECONDS):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._last_purge = datetime.utcnow()
+        # Recent latencies in seconds: time waiting to be claimed and run time
+        self._wait_times: Deque[float] = deque(maxlen=1000)
+        self._run_times: Deque[float] = deque(maxlen=1000)
+
+    async def start(self) -> None:
+        """Start the consumer tasks on the running event loop."""
+        try:
+            await asyncio.to_thread(_ensure_schema)
+        except Exception as e:
+            logging.warning(f"Job queue initialization warning, consumers not started: {e}")
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        logging.info(f"Job queue started with {self.concurrency} consumers on {self.worker_id}")
+
+    async def stop(self) -> None:
+        """Cancel the consumer tasks; running jobs are retried after their lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+        logging.info("Job queue stopped")
+
+    def notify(self) -> None:
+        """Wake an idle consumer after a job was enqueued in this worker."""
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _claimable(self, now: datetime):
+        """Filter for jobs that are due or whose lease has expired."""
+        stale = now - timedelta(seconds=JOB_LEASE_SECONDS)
+        return or_(
+            and_(Job.status == "queued", Job.run_after <= now),
+            and_(Job.status == "running", Job.started_at < stale)
+        )
+
+    def _claim(self) -> Optional[Job]:
+        """Atomically claim the next due job, or return None if there is none."""
+        db = JobSession()
+        try:
+            for _ in range(3):
+                now = datetime.utcnow()
+                candidate = db.query(Job.id).filter(self._claimable(now)).order_by(
+                    Job.run_after, Job.id
+                ).first()
+                if candidate is None:
+                    return None
+                # The guarded update only succeeds for one worker
+                claimed = db.execute(
+                    update(Job)
+                    .where(Job.id == candidate.id, self._claimable(now))
+                    .values(
+                        status="running",
+                        started_at=now,
+                        locked_by=self.worker_id,
+                        attempts=Job.attempts + 1
+                    )
+                ).rowcount
+                db.commit()
+                if claimed:
+                    return db.get(Job, candidate.id)
+            return None
+        finally:
+            db.close()
+
+    def _complete(self, job_id: int) -> None:
+        """Mark a job as done."""
+        db = JobSession()
+        try:
+            db.execute(
+                update(Job).where(Job.id == job_id).values(
+                    status="done", finished_at=datetime.utcnow(), last_error=None
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _fail(self, claimed: Job, error: str, permanent: bool = False) -> None:
+        """Schedule a retry with exponential backoff, or give up after max_attempts."""
+        db = JobSession()
+        try:
+            now = datetime.utcnow()
+            if permanent or claimed.attempts >= claimed.max_attempts:
+                values = {"status": "failed", "finished_at": now}
+                logging.error(f"Job {claimed.id} ({claimed.name}) failed permanently: {error}")
+            else:
+                backoff = min(
+                    JOB_BACKOFF_MAX_SECONDS,
+                    JOB_BACKOFF_BASE_SECONDS * 2 ** (claimed.attempts - 1)
+                ) * random.uniform(0.5, 1.0)
+                values = {"status": "queued", "run_after": now + timedelta(seconds=backoff)}
+                logging.warning(f"Job {claimed.id} ({claimed.name}) failed, retrying in {backoff:.1f}s: {error}")
+            db.execute(
+                update(Job).where(Job.id == claimed.id).values(
+                    last_error=error[:2000], locked_by=None, **values
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _purge(self) -> None:
+        """Delete finished jobs older than the retention period."""
+        db = JobSession()
+        try:
+            cutoff = datetime.utcnow() - timedelta(hours=JOB_RETENTION_HOURS)
+            db.execute(delete(Job).where(Job.status == "done", Job.finished_at < cutoff))
+            db.commit()
+        finally:
+            db.close()
+
+    async def _run(self, claimed: Job) -> None:
+        """Execute a claimed job and record its outcome."""
+        started = datetime.utcnow()
+        self._wait_times.append(max((started - claimed.run_after).total_seconds(), 0.0))
+        handler = _handlers.get(claimed.name)
+        if handler is None:
+            # Retrying cannot help, the same code will still lack the handler
+            await asyncio.to_thread(self._fail, claimed, f"No handler registered for job '{claimed.name}'", True)
+            return
+        try:
+            payload = json.loads(claimed.payload)
+            if asyncio.iscoroutinefunction(handler):
+                await handler(payload)
+            else:
+                await asyncio.to_thread(handler, payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await asyncio.to_thread(self._fail, claimed, f"{type(e).__name__}: {e}")
+        else:
+            await asyncio.to_thread(self._complete, claimed.id)
+        finally:
+            self._run_times.append((datetime.utcnow() - started).total_seconds())
+
+    async def _consume(self) -> None:
+        """Consumer loop: claim and run jobs, idling on the wake event."""
+        while True:
+            try:
+                claimed = await asyncio.to_thread(self._claim)
+                if claimed is not None:
+                    await self._run(claimed)
+                    continue
+                if datetime.utcnow() - self._last_purge > timedelta(minutes=10):
+                    self._last_purge = datetime.utcnow()
+                    await asyncio.to_thread(self._purge)
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Job consumer error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> JobQueueStats:
+        """Return queue depth by status and recent latencies of this worker."""
+        _ensure_schema()
+        db = JobSession()
+        try:
+            counts = dict(db.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+        finally:
+            db.close()
+        return JobQueueStats(
+            queued=counts.get("queued", 0),
+            running=counts.get("running", 0),
+            failed=counts.get("failed", 0),
+            done=counts.get("done", 0),
+            worker_id=self.worker_id,
+            consumers=len(self._tasks),
+            wait_p50_ms=_percentile(self._wait_times, 0.5) * 1000,
+            wait_p95_ms=_percentile(self._wait_times, 0.95) * 1000,
+            run_p50_ms=_percentile(self._run_times, 0.5) * 1000,
+            run_p95_ms=_percentile(self._run_times, 0.95) * 1000
+        )
+
+
+# Global queue instance for this worker
+job_queue = JobQueue()
+
+# Create router
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/jobs", response_model=JobQueueStats)
+async def get_job_stats(current_user = Depends(require_roles("admin"))):
+    """Get job queue depth and latency."""
+    return await asyncio.to_thread(job_queue.stats)
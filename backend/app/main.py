@@ -1,12 +1,25 @@
 import os
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
+from .admission import AdmissionControlMiddleware, load_monitor, ADMISSION_RETRY_AFTER_SECONDS
 from .auth import router as auth_router
+from .counters import router as counters_router
+from .events import router as events_router
+from .export import router as export_router
+from .feed import router as feed_router
+from .friend_graph import friend_graph
+from .friends import router as friends_router
+from .images import router as images_router, shutdown_image_workers
+from .jobs import router as jobs_router, job_queue, JOB_QUEUE_ENABLED
+from .messages import router as messages_router
+from .recommend import router as recommend_router
 from .db import get_engine, SessionLocal
 from .models import Base
 
@@ -25,6 +38,23 @@ def setup_logging() -> None:
     )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop per-worker background services."""
+    await load_monitor.start()
+    await friend_graph.start()
+    if JOB_QUEUE_ENABLED:
+        await job_queue.start()
+    try:
+        yield
+    finally:
+        if JOB_QUEUE_ENABLED:
+            await job_queue.stop()
+        await friend_graph.stop()
+        shutdown_image_workers()
+        await load_monitor.stop()
+
+
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
     setup_logging()
@@ -34,9 +64,13 @@ def create_app() -> FastAPI:
         description="Backend API for GetOut social event management app",
         version=app_version(),
         docs_url="/docs",
-        redoc_url="/redoc"
+        redoc_url="/redoc",
+        lifespan=lifespan
     )
     
+    # Admission control (added first so CORS wraps it and shed responses carry CORS headers)
+    app.add_middleware(AdmissionControlMiddleware, monitor=load_monitor)
+    
     # CORS Configuration
     cors_origins = os.getenv("CORS_ORIGINS", "*").split(",")
     app.add_middleware(
@@ -68,6 +102,15 @@ def create_app() -> FastAPI:
     
     # Include routers
     app.include_router(auth_router)
+    app.include_router(export_router)
+    app.include_router(counters_router)
+    app.include_router(friends_router)
+    app.include_router(messages_router)
+    app.include_router(events_router)
+    app.include_router(feed_router)
+    app.include_router(recommend_router)
+    app.include_router(images_router)
+    app.include_router(jobs_router)
     
     # Health endpoints
     @app.get("/")
@@ -92,7 +135,13 @@ def create_app() -> FastAPI:
     
     @app.get("/readyz")
     async def readiness():
-        """Readiness probe endpoint."""
+        """Readiness probe endpoint, not ready while the worker is saturated."""
+        if load_monitor.saturated():
+            return JSONResponse(
+                status_code=503,
+                content={"ready": "saturated", **load_monitor.snapshot()},
+                headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)}
+            )
         return {"ready": "ok"}
     
     # Protected example routes
@@ -0,0 +1,76 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from .counters import adjust_counters
+from .db import get_db
+from .models import User, ChatMessage
+from .schemas import ChatMessageCreate, ChatMessageOut, MessageResponse
+from .security import get_current_user
+
+# Create router
+router = APIRouter(prefix="/messages", tags=["messages"])
+
+
+@router.post("/", response_model=ChatMessageOut, status_code=status.HTTP_201_CREATED)
+async def send_message(
+    message_data: ChatMessageCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Send a chat message to another user."""
+    receiver = db.query(User).filter(User.id == message_data.receiver_id).first()
+    if not receiver or not receiver.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Receiver not found"
+        )
+
+    message = ChatMessage(
+        sender_id=current_user.id,
+        receiver_id=receiver.id,
+        content=message_data.content,
+        message_type=message_data.message_type,
+        is_read=False
+    )
+
+    try:
+        db.add(message)
+        adjust_counters(db, receiver.id, unread_messages=1)
+        db.commit()
+        db.refresh(message)
+        return message
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Failed to send message: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to send message"
+        )
+
+
+@router.post("/conversations/{user_id}/read", response_model=MessageResponse)
+async def mark_conversation_read(
+    user_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Mark all messages from a user to the current user as read."""
+    try:
+        marked = db.query(ChatMessage).filter(
+            ChatMessage.sender_id == user_id,
+            ChatMessage.receiver_id == current_user.id,
+            ChatMessage.is_read == False
+        ).update({"is_read": True}, synchronize_session=False)
+        if marked:
+            adjust_counters(db, current_user.id, unread_messages=-marked)
+        db.commit()
+        return MessageResponse(message=f"{marked} messages marked as read")
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Failed to mark messages as read: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to mark messages as read"
+        )
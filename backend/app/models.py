@@ -106,6 +106,8 @@ class Friendship(Base):
     # Unique constraint to prevent duplicate friendship requests
     __table_args__ = (
         Index('ix_friendships_unique', 'requester_id', 'addressee_id', unique=True),
+        Index('ix_friendships_addressee_status', 'addressee_id', 'status'),
+        Index('ix_friendships_updated_at', 'updated_at'),
     )
 
 
@@ -124,3 +126,59 @@ class ChatMessage(Base):
     # Relationships
     sender = relationship("User", foreign_keys=[sender_id])
     receiver = relationship("User", foreign_keys=[receiver_id])
+    
+    # Index for unread lookups per receiver
+    __table_args__ = (
+        Index('ix_chat_messages_receiver_unread', 'receiver_id', 'is_read'),
+    )
+
+
+class UserCounter(Base):
+    """Denormalized per-user counters for badge endpoints."""
+    __tablename__ = "user_counters"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    unread_messages = Column(Integer, default=0, nullable=False)
+    pending_friend_requests = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    user = relationship("User")
+
+
+class Activity(Base):
+    """Activity of a user (event created, RSVP) shown in friends' feeds."""
+    __tablename__ = "activities"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    actor_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    verb = Column(String(20), nullable=False)  # event_created, rsvp
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    fanned_out = Column(Boolean, default=True)  # False: pulled by readers instead
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    actor = relationship("User")
+    event = relationship("Event")
+    
+    # Index for fan-out-on-read of high-degree actors
+    __table_args__ = (
+        Index('ix_activities_pull', 'fanned_out', 'actor_id', 'id'),
+    )
+
+
+class FeedItem(Base):
+    """Materialized feed entry written to each friend at activity time."""
+    __tablename__ = "feed_items"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    activity_id = Column(Integer, ForeignKey("activities.id", ondelete="CASCADE"), nullable=False)
+    
+    # Relationships
+    activity = relationship("Activity")
+    
+    # One entry per activity and owner, ordered newest first on read
+    __table_args__ = (
+        Index('ix_feed_items_owner_activity', 'owner_id', 'activity_id', unique=True),
+    )
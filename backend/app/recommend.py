@@ -0,0 +1,264 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .db import get_db
+from .friends import accepted_friend_ids
+from .models import User, Event, EventAttendee
+from .schemas import EventOut, RecommendedEventOut
+from .security import get_current_user
+
+# Recommendation configuration
+RECOMMEND_REFRESH_SECONDS = int(os.getenv("RECOMMEND_REFRESH_SECONDS", "300"))
+RECOMMEND_BATCH_SIZE = int(os.getenv("RECOMMEND_BATCH_SIZE", "16384"))
+RECOMMEND_TIME_SCALE_DAYS = float(os.getenv("RECOMMEND_TIME_SCALE_DAYS", "7"))
+
+# Score weights
+WEIGHT_AFFINITY = 3.0
+WEIGHT_FRIENDS = 2.0
+WEIGHT_SOON = 1.0
+WEIGHT_CAPACITY = 0.5
+
+EPOCH = datetime(1970, 1, 1)
+
+# Create router
+router = APIRouter(prefix="/recommendations", tags=["recommendations"])
+
+
+def _timestamp(value: datetime) -> float:
+    """Convert a naive UTC datetime to epoch seconds."""
+    return (value - EPOCH).total_seconds()
+
+
+class CandidateMatrix:
+    """Feature arrays of upcoming public events, sorted by event id."""
+
+    def __init__(self, rows: List[tuple], built_at: float):
+        self.built_at = built_at
+        self.categories: List[str] = []
+        category_codes: Dict[str, int] = {}
+        codes = []
+        for row in rows:
+            category = row[2] or "social"
+            if category not in category_codes:
+                category_codes[category] = len(self.categories)
+                self.categories.append(category)
+            codes.append(category_codes[category])
+
+        self.category_codes = category_codes
+        self.event_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        self.creator_ids = np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows))
+        self.category = np.asarray(codes, dtype=np.int32)
+        self.event_ts = np.fromiter((_timestamp(r[3]) for r in rows), dtype=np.float64, count=len(rows))
+        self.capacity = np.fromiter((max(r[4] or 1, 1) for r in rows), dtype=np.float32, count=len(rows))
+        self.attending = np.fromiter((r[5] for r in rows), dtype=np.float32, count=len(rows))
+
+    def __len__(self) -> int:
+        return len(self.event_ids)
+
+    def positions(self, event_ids):
+        """Return (indices, found) locating event ids in the sorted id array."""
+        ids = np.asarray(event_ids, dtype=np.int64)
+        if len(self) == 0:
+            return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+        pos = np.minimum(np.searchsorted(self.event_ids, ids), len(self) - 1)
+        return pos, self.event_ids[pos] == ids
+
+
+def build_candidate_matrix(db: Session) -> CandidateMatrix:
+    """Load upcoming public events and their attendance into a CandidateMatrix."""
+    now = datetime.utcnow()
+    attending = db.query(
+        EventAttendee.event_id,
+        func.count(EventAttendee.id).label("attending")
+    ).join(Event, Event.id == EventAttendee.event_id).filter(
+        EventAttendee.status == "attending",
+        Event.event_date > now
+    ).group_by(EventAttendee.event_id).subquery()
+
+    rows = db.query(
+        Event.id,
+        Event.creator_id,
+        Event.category,
+        Event.event_date,
+        Event.max_attendees,
+        func.coalesce(attending.c.attending, 0)
+    ).outerjoin(attending, attending.c.event_id == Event.id).filter(
+        Event.is_public == True,
+        Event.event_date > now
+    ).order_by(Event.id).all()
+
+    return CandidateMatrix(rows, time.monotonic())
+
+
+class CandidateCache:
+    """Keeps the candidate matrix in memory and refreshes it periodically."""
+
+    def __init__(self, max_age_seconds: int = RECOMMEND_REFRESH_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._matrix: Optional[CandidateMatrix] = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> CandidateMatrix:
+        """Return the cached matrix, rebuilding it when it is too old.
+
+        While a rebuild is running other requests keep using the old matrix.
+        """
+        matrix = self._matrix
+        if matrix is not None and time.monotonic() - matrix.built_at < self.max_age_seconds:
+            return matrix
+        if matrix is not None and not self._lock.acquire(blocking=False):
+            return matrix
+        if matrix is None:
+            self._lock.acquire()
+        try:
+            if self._matrix is None or self._matrix is matrix:
+                started = time.perf_counter()
+                self._matrix = build_candidate_matrix(db)
+                logging.info(
+                    f"Recommendation candidates rebuilt: {len(self._matrix)} events "
+                    f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+                )
+            return self._matrix
+        finally:
+            self._lock.release()
+
+
+candidate_cache = CandidateCache()
+
+
+def _category_affinity(db: Session, user_id: int, matrix: CandidateMatrix) -> np.ndarray:
+    """Share of the user's past attendances per candidate category."""
+    affinity = np.zeros(len(matrix.categories), dtype=np.float32)
+    counts = db.query(Event.category, func.count(EventAttendee.id)).join(
+        Event, Event.id == EventAttendee.event_id
+    ).filter(
+        EventAttendee.user_id == user_id,
+        EventAttendee.status == "attending"
+    ).group_by(Event.category).all()
+    total = sum(count for _, count in counts)
+    for category, count in counts:
+        code = matrix.category_codes.get(category or "social")
+        if code is not None:
+            affinity[code] = count / total
+    return affinity
+
+
+def _friends_attending(db: Session, user_id: int, matrix: CandidateMatrix) -> np.ndarray:
+    """Number of accepted friends attending each candidate event."""
+    friends = np.zeros(len(matrix), dtype=np.float32)
+    friend_ids = accepted_friend_ids(db, user_id)
+    if not friend_ids:
+        return friends
+    rows = db.query(EventAttendee.event_id, func.count(EventAttendee.id)).join(
+        Event, Event.id == EventAttendee.event_id
+    ).filter(
+        EventAttendee.user_id.in_(friend_ids),
+        EventAttendee.status == "attending",
+        Event.is_public == True,
+        Event.event_date > datetime.utcnow()
+    ).group_by(EventAttendee.event_id).all()
+    if rows:
+        event_ids, counts = zip(*rows)
+        pos, found = matrix.positions(event_ids)
+        friends[pos[found]] = np.asarray(counts, dtype=np.float32)[found]
+    return friends
+
+
+def score_candidates(
+    matrix: CandidateMatrix,
+    affinity: np.ndarray,
+    friends: np.ndarray,
+    excluded: np.ndarray,
+    now_ts: float,
+    limit: int
+):
+    """Score all candidates in batches and return (indices, scores) of the top `limit`."""
+    top_idx = []
+    top_scores = []
+    for start in range(0, len(matrix), RECOMMEND_BATCH_SIZE):
+        batch = slice(start, start + RECOMMEND_BATCH_SIZE)
+        days_until = (matrix.event_ts[batch] - now_ts) / 86400.0
+        remaining = matrix.capacity[batch] - matrix.attending[batch]
+
+        scores = (
+            WEIGHT_AFFINITY * affinity[matrix.category[batch]]
+            + WEIGHT_FRIENDS * np.log1p(friends[batch])
+            + WEIGHT_SOON * np.exp(-np.clip(days_until, 0.0, None) / RECOMMEND_TIME_SCALE_DAYS)
+            + WEIGHT_CAPACITY * np.clip(remaining / matrix.capacity[batch], 0.0, 1.0)
+        )
+        scores[(remaining <= 0) | (days_until < 0) | excluded[batch]] = -np.inf
+
+        k = min(limit, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        top_idx.append(best + start)
+        top_scores.append(scores[best])
+
+    if not top_idx:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    idx = np.concatenate(top_idx)
+    scores = np.concatenate(top_scores)
+    order = np.argsort(-scores, kind="stable")[:limit]
+    keep = np.isfinite(scores[order])
+    return idx[order][keep], scores[order][keep]
+
+
+def recommend_events(db: Session, user: User, limit: int) -> List[RecommendedEventOut]:
+    """Rank upcoming public events for a user."""
+    matrix = candidate_cache.get(db)
+    if len(matrix) == 0:
+        return []
+
+    # Skip events the user created or already responded to
+    excluded = matrix.creator_ids == user.id
+    responded = [row[0] for row in db.query(EventAttendee.event_id).filter(
+        EventAttendee.user_id == user.id
+    )]
+    pos, found = matrix.positions(responded)
+    excluded[pos[found]] = True
+
+    idx, scores = score_candidates(
+        matrix,
+        _category_affinity(db, user.id, matrix),
+        _friends_attending(db, user.id, matrix),
+        excluded,
+        _timestamp(datetime.utcnow()),
+        limit
+    )
+    if len(idx) == 0:
+        return []
+
+    event_ids = [int(i) for i in matrix.event_ids[idx]]
+    events = {e.id: e for e in db.query(Event).filter(Event.id.in_(event_ids))}
+    results = []
+    for position, event_id, score in zip(idx, event_ids, scores):
+        event = events.get(event_id)
+        if event is None:
+            continue
+        results.append(RecommendedEventOut(
+            **EventOut.model_validate(event).model_dump(exclude={"attendee_count", "is_attending"}),
+            attendee_count=int(matrix.attending[position]),
+            is_attending=False,
+            score=float(score)
+        ))
+    return results
+
+
+@router.get("/events", response_model=List[RecommendedEventOut])
+async def get_recommended_events(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get upcoming public events recommended for the current user."""
+    # Matrix rebuilds and scoring are CPU-bound, keep them off the event loop
+    return await asyncio.to_thread(recommend_events, db, current_user, limit)
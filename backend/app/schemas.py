@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -102,6 +102,11 @@ class EventOut(BaseModel):
         from_attributes = True
 
 
+class RecommendedEventOut(EventOut):
+    """Schema for a recommended event with its ranking score."""
+    score: float
+
+
 # Event Attendee Schemas
 class EventAttendeeCreate(BaseModel):
     """Schema for joining an event."""
@@ -147,6 +152,18 @@ class FriendshipOut(BaseModel):
         from_attributes = True
 
 
+class MutualFriendsOut(BaseModel):
+    """Schema for the number of mutual friends with another user."""
+    user_id: int
+    mutual_count: int
+
+
+class FriendSuggestionOut(BaseModel):
+    """Schema for a friends-of-friends suggestion."""
+    user_id: int
+    mutual_count: int
+
+
 # Chat Message Schemas
 class ChatMessageCreate(BaseModel):
     """Schema for creating chat message."""
@@ -171,6 +188,54 @@ class ChatMessageOut(BaseModel):
         from_attributes = True
 
 
+# Image Schemas
+class ImageUploadOut(BaseModel):
+    """Schema for an uploaded image and its thumbnail URLs by size."""
+    hash: str
+    urls: Dict[str, str]
+
+
+# Feed Schemas
+class FeedItemOut(BaseModel):
+    """Schema for a single activity in the friends feed."""
+    id: int
+    actor_id: int
+    verb: str
+    event_id: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class FeedPage(BaseModel):
+    """Schema for a page of the friends feed."""
+    items: List[FeedItemOut]
+    next_before_id: Optional[int] = None
+
+
+# Badge Schemas
+class BadgeCounts(BaseModel):
+    """Schema for app badge counters."""
+    unread_messages: int = 0
+    pending_friend_requests: int = 0
+
+
+# Job Queue Schemas
+class JobQueueStats(BaseModel):
+    """Schema for job queue depth and latency."""
+    queued: int
+    running: int
+    failed: int
+    done: int
+    worker_id: str
+    consumers: int
+    wait_p50_ms: float
+    wait_p95_ms: float
+    run_p50_ms: float
+    run_p95_ms: float
+
+
 # Response Schemas
 class MessageResponse(BaseModel):
     """Generic message response schema."""
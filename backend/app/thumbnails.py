@@ -0,0 +1,64 @@
+import os
+from typing import List
+
+from PIL import Image, ImageOps
+
+# Reject images that would decode to more pixels than this
+MAX_IMAGE_PIXELS = 40_000_000
+
+# JPEG encoder settings for stored thumbnails
+JPEG_QUALITY = 85
+
+# JPEG has no alpha channel, transparent areas are filled with this colour
+BACKGROUND_COLOR = (255, 255, 255)
+
+
+def thumbnail_path(root: str, digest: str, size: int) -> str:
+    """Return the content-addressed path of a thumbnail."""
+    return os.path.join(root, digest[:2], f"{digest}_{size}.jpg")
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """Convert to RGB, compositing transparent areas onto the background colour."""
+    if image.mode == "P" and "transparency" in image.info:
+        image = image.convert("RGBA")
+    if image.mode in ("RGBA", "LA", "PA"):
+        background = Image.new("RGB", image.size, BACKGROUND_COLOR)
+        background.paste(image.convert("RGBA"), mask=image.getchannel("A"))
+        return background
+    if image.mode != "RGB":
+        return image.convert("RGB")
+    return image
+
+
+def make_thumbnails(source_path: str, root: str, digest: str, sizes: List[int]) -> List[int]:
+    """Decode an image and write a JPEG thumbnail for each size.
+
+    Runs in a worker process, so this module only depends on Pillow.
+    Returns the sizes that were written.
+    """
+    try:
+        image = Image.open(source_path)
+    except Image.DecompressionBombError as e:
+        raise ValueError(str(e))
+    with image:
+        width, height = image.size
+        if width * height > MAX_IMAGE_PIXELS:
+            raise ValueError(f"Image too large: {width}x{height}")
+        os.makedirs(os.path.join(root, digest[:2]), exist_ok=True)
+
+        # Let the JPEG decoder downscale while decoding
+        largest = max(sizes)
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        image = _flatten(image)
+
+        # Downscale from the largest size so each step works on fewer pixels
+        for size in sorted(sizes, reverse=True):
+            image.thumbnail((size, size), Image.LANCZOS)
+            path = thumbnail_path(root, digest, size)
+            partial = f"{path}.{os.getpid()}.tmp"
+            image.save(partial, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+            os.replace(partial, path)
+
+    return sorted(sizes)
@@ -0,0 +1,164 @@
+"""Benchmark friends-feed reads: materialized feed vs. join at read time.
+
+Seeds a temporary SQLite database with users, accepted friendships, events
+and RSVPs, materializes the feed the way record_activity does, and times
+read_feed against the Friendship x Event x EventAttendee join.
+
+Run from the backend directory:
+    python benchmarks/bench_feed.py [--users 2000] [--friends 50] [--events 5000] [--rsvps 20000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, literal, select, union_all, or_  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import feed  # noqa: E402
+from app.models import Base, User, Friendship, Event, EventAttendee, Activity, FeedItem  # noqa: E402
+
+
+def seed(Session, args) -> None:
+    """Insert the synthetic social graph and its materialized feeds."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    db = Session()
+    db.execute(insert(User), [
+        {"id": uid, "email": f"user{uid}@example.com", "hashed_password": "x", "created_at": now}
+        for uid in range(1, args.users + 1)
+    ])
+
+    # Random accepted friendships, plus a few very high-degree users
+    edges = set()
+    while len(edges) < args.users * args.friends // 2:
+        a, b = rng.randint(1, args.users), rng.randint(1, args.users)
+        if a != b:
+            edges.add((min(a, b), max(a, b)))
+    for celebrity in range(1, args.celebrities + 1):
+        for other in rng.sample(range(args.celebrities + 1, args.users + 1), feed.FEED_FANOUT_MAX_FRIENDS + 100):
+            edges.add((celebrity, other))
+    db.execute(insert(Friendship), [
+        {"requester_id": a, "addressee_id": b, "status": "accepted", "created_at": now, "updated_at": now}
+        for a, b in edges
+    ])
+    adjacency = {uid: [] for uid in range(1, args.users + 1)}
+    for a, b in edges:
+        adjacency[a].append(b)
+        adjacency[b].append(a)
+
+    # Events and RSVPs in chronological order, with their activities
+    events, attendees, activities = [], [], []
+    happenings = []
+    for event_id in range(1, args.events + 1):
+        created = now - timedelta(minutes=args.events - event_id)
+        creator = rng.randint(1, args.users)
+        events.append({
+            "id": event_id, "title": f"Event {event_id}", "event_date": now + timedelta(days=7),
+            "creator_id": creator, "is_public": True, "created_at": created, "updated_at": created
+        })
+        happenings.append((created, creator, "event_created", event_id))
+    rsvp_pairs = set()
+    while len(rsvp_pairs) < args.rsvps:
+        rsvp_pairs.add((rng.randint(1, args.events), rng.randint(1, args.users)))
+    for event_id, user_id in rsvp_pairs:
+        joined = events[event_id - 1]["created_at"] + timedelta(seconds=rng.randint(1, 3600))
+        attendees.append({"event_id": event_id, "user_id": user_id, "status": "attending", "joined_at": joined})
+        happenings.append((joined, user_id, "rsvp", event_id))
+    happenings.sort()
+    db.execute(insert(Event), events)
+    db.execute(insert(EventAttendee), attendees)
+
+    feed_rows = []
+    for activity_id, (created, actor, verb, event_id) in enumerate(happenings, start=1):
+        fan_out = len(adjacency[actor]) <= feed.FEED_FANOUT_MAX_FRIENDS
+        activities.append({
+            "id": activity_id, "actor_id": actor, "verb": verb, "event_id": event_id,
+            "fanned_out": fan_out, "created_at": created
+        })
+        if fan_out:
+            feed_rows.extend({"owner_id": owner, "activity_id": activity_id} for owner in adjacency[actor])
+    db.execute(insert(Activity), activities)
+    for start in range(0, len(feed_rows), 100_000):
+        db.execute(insert(FeedItem), feed_rows[start:start + 100_000])
+    user_ids = list(adjacency)
+    for start in range(0, len(user_ids), 500):
+        feed._trim_feeds(db, user_ids[start:start + 500])
+    db.commit()
+    db.close()
+    print(f"Seeded {args.users} users, {len(edges)} friendships, {len(activities)} activities, "
+          f"{len(feed_rows)} feed rows before trimming")
+
+
+def join_feed(db, user_id: int, limit: int) -> list:
+    """Friends' activity computed at read time from the source tables."""
+    friends = union_all(
+        select(Friendship.addressee_id.label("friend_id")).where(
+            Friendship.requester_id == user_id, Friendship.status == "accepted"),
+        select(Friendship.requester_id.label("friend_id")).where(
+            Friendship.addressee_id == user_id, Friendship.status == "accepted"),
+    ).subquery()
+    created = select(
+        Event.creator_id.label("actor_id"), literal("event_created").label("verb"),
+        Event.id.label("event_id"), Event.created_at.label("created_at")
+    ).join(friends, friends.c.friend_id == Event.creator_id).where(Event.is_public == True)
+    rsvps = select(
+        EventAttendee.user_id.label("actor_id"), literal("rsvp").label("verb"),
+        EventAttendee.event_id.label("event_id"), EventAttendee.joined_at.label("created_at")
+    ).join(friends, friends.c.friend_id == EventAttendee.user_id).join(
+        Event, Event.id == EventAttendee.event_id
+    ).where(Event.is_public == True, or_(EventAttendee.status == "attending", EventAttendee.status == "maybe"))
+    combined = union_all(created, rsvps).subquery()
+    return db.execute(select(combined).order_by(combined.c.created_at.desc()).limit(limit)).all()
+
+
+def timed(func, user_ids: list) -> list:
+    """Call func for every user and return the durations in milliseconds."""
+    durations = []
+    for user_id in user_ids:
+        started = time.perf_counter()
+        func(user_id)
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def report(name: str, durations: list) -> None:
+    """Print median and p95 of durations."""
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name:<26} median {statistics.median(ordered):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--friends", type=int, default=50, help="average accepted friends per user")
+    parser.add_argument("--celebrities", type=int, default=3, help="users above FEED_FANOUT_MAX_FRIENDS")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--rsvps", type=int, default=20000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'feed.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        seed(Session, args)
+
+        user_ids = random.Random(7).sample(range(1, args.users + 1), args.samples)
+        db = Session()
+        report("read_feed (fan-out)", timed(lambda uid: feed.read_feed(db, uid, None, args.limit), user_ids))
+        report("join at read time", timed(lambda uid: join_feed(db, uid, args.limit), user_ids))
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
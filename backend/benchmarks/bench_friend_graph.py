@@ -0,0 +1,149 @@
+"""Benchmark the in-memory friend graph against SQL self-joins.
+
+Seeds a temporary SQLite database with random accepted friendships, builds
+the FriendGraph from it and times friend suggestions and mutual friend counts
+against indexed self-join queries that return the same results.
+
+Run from the backend directory:
+    python benchmarks/bench_friend_graph.py [--edges 1000000] [--users 100000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import friend_graph as friend_graph_module  # noqa: E402
+from app.models import Base, Friendship  # noqa: E402
+
+# Both directions of each lookup use an index: ix_friendships_unique leads with
+# requester_id and ix_friendships_addressee_status with addressee_id
+FRIENDS_CTE = """
+    WITH friends(id) AS (
+        SELECT addressee_id FROM friendships WHERE requester_id = :u AND status = 'accepted'
+        UNION
+        SELECT requester_id FROM friendships WHERE addressee_id = :u AND status = 'accepted'
+    )
+"""
+
+# Same result as FriendGraph.suggestions: friends-of-friends that are not
+# the user or already friends, by mutual count, ties broken by lower id
+SUGGESTIONS_SQL = text(FRIENDS_CTE + """
+    SELECT other, COUNT(*) AS mutual
+    FROM (
+        SELECT f.addressee_id AS other FROM friends
+        JOIN friendships f ON f.requester_id = friends.id AND f.status = 'accepted'
+        UNION ALL
+        SELECT f.requester_id FROM friends
+        JOIN friendships f ON f.addressee_id = friends.id AND f.status = 'accepted'
+    ) AS candidates
+    WHERE other != :u AND other NOT IN (SELECT id FROM friends)
+    GROUP BY other
+    ORDER BY mutual DESC, other
+    LIMIT :limit
+""")
+
+# Same result as FriendGraph.mutual_count: a's friends that are also b's friends
+MUTUAL_SQL = text(FRIENDS_CTE + """
+    SELECT COUNT(*) FROM friends
+    WHERE friends.id IN (
+        SELECT addressee_id FROM friendships WHERE requester_id = :b AND status = 'accepted'
+        UNION
+        SELECT requester_id FROM friendships WHERE addressee_id = :b AND status = 'accepted'
+    )
+""")
+
+
+def seed(engine, edges: int, users: int) -> None:
+    """Insert random accepted friendships between user ids 1..users."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    pairs = set()
+    while len(pairs) < edges:
+        a, b = rng.randint(1, users), rng.randint(1, users)
+        if a != b:
+            pairs.add((min(a, b), max(a, b)))
+    rows = [
+        {"requester_id": a, "addressee_id": b, "status": "accepted", "created_at": now, "updated_at": now}
+        for a, b in pairs
+    ]
+    with engine.begin() as conn:
+        for start in range(0, len(rows), 100_000):
+            conn.execute(Friendship.__table__.insert(), rows[start:start + 100_000])
+
+
+def timed(func, repeat: int) -> list:
+    """Call func repeat times and return the durations in milliseconds."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def report(name: str, durations: list) -> None:
+    """Print median and best of durations."""
+    print(f"{name:<26} median {statistics.median(durations):11.3f} ms   best {min(durations):11.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--samples", type=int, default=200, help="users timed on the in-memory graph")
+    parser.add_argument("--sql-samples", type=int, default=200, help="users checked and timed on the SQL queries")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'friends.db')}")
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.edges, args.users)
+        print(f"Seeded {args.edges} friendships between {args.users} users")
+
+        # FriendGraph reads through the app's session factory
+        friend_graph_module.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        graph = friend_graph_module.FriendGraph()
+        report("FriendGraph.build", timed(graph.build, 1))
+
+        rng = random.Random(7)
+        users = [rng.randint(1, args.users) for _ in range(args.samples)]
+        pairs = [(rng.randint(1, args.users), rng.randint(1, args.users)) for _ in range(args.samples)]
+        graph_suggestions = [timed(lambda: graph.suggestions(u, args.limit), 1)[0] for u in users]
+        graph_mutual = [timed(lambda: graph.mutual_count(a, b), 1)[0] for a, b in pairs]
+        report("graph suggestions", graph_suggestions)
+        report("graph mutual_count", graph_mutual)
+
+        with engine.connect() as conn:
+            # Check that both sides compute the same result before timing them
+            for u in users[:args.sql_samples]:
+                expected = graph.suggestions(u, args.limit)
+                actual = [tuple(row) for row in conn.execute(SUGGESTIONS_SQL, {"u": u, "limit": args.limit})]
+                assert actual == expected, f"suggestions differ for user {u}"
+            for a, b in pairs[:args.sql_samples]:
+                assert conn.execute(MUTUAL_SQL, {"u": a, "b": b}).scalar() == graph.mutual_count(a, b)
+
+            sql_suggestions = [
+                timed(lambda: conn.execute(SUGGESTIONS_SQL, {"u": u, "limit": args.limit}).all(), 1)[0]
+                for u in users[:args.sql_samples]
+            ]
+            sql_mutual = [
+                timed(lambda: conn.execute(MUTUAL_SQL, {"u": a, "b": b}).scalar(), 1)[0]
+                for a, b in pairs[:args.sql_samples]
+            ]
+        report("SQL suggestions", sql_suggestions)
+        report("SQL mutual count", sql_mutual)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
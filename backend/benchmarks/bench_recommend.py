@@ -0,0 +1,105 @@
+"""Benchmark vectorized recommendation scoring at 100k candidate events.
+
+Run from the backend directory:
+    python benchmarks/bench_recommend.py [--events 100000] [--repeat 50]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.recommend import (  # noqa: E402
+    CandidateMatrix, score_candidates, _timestamp,
+    WEIGHT_AFFINITY, WEIGHT_FRIENDS, WEIGHT_SOON, WEIGHT_CAPACITY, RECOMMEND_TIME_SCALE_DAYS
+)
+
+CATEGORIES = ["social", "sports", "music", "food", "outdoor", "culture", "games", "tech"]
+
+
+def synthetic_rows(count: int, now: datetime) -> list:
+    """Rows shaped like build_candidate_matrix's query result."""
+    rng = random.Random(42)
+    return [
+        (
+            event_id,
+            rng.randint(1, 50_000),
+            rng.choice(CATEGORIES),
+            now + timedelta(minutes=rng.randint(1, 90 * 24 * 60)),
+            rng.choice([10, 20, 50, 100, 500]),
+            rng.randint(0, 60),
+        )
+        for event_id in range(1, count + 1)
+    ]
+
+
+def python_loop_scores(matrix: CandidateMatrix, affinity, friends, now_ts: float, limit: int) -> list:
+    """Reference implementation scoring one candidate at a time."""
+    scored = []
+    for i in range(len(matrix)):
+        days = (matrix.event_ts[i] - now_ts) / 86400.0
+        remaining = matrix.capacity[i] - matrix.attending[i]
+        if remaining <= 0 or days < 0:
+            continue
+        score = (
+            WEIGHT_AFFINITY * affinity[matrix.category[i]]
+            + WEIGHT_FRIENDS * np.log1p(friends[i])
+            + WEIGHT_SOON * np.exp(-max(days, 0.0) / RECOMMEND_TIME_SCALE_DAYS)
+            + WEIGHT_CAPACITY * min(max(remaining / matrix.capacity[i], 0.0), 1.0)
+        )
+        scored.append((score, i))
+    scored.sort(reverse=True)
+    return scored[:limit]
+
+
+def timed(func, repeat: int) -> list:
+    """Run func repeat times and return the durations in milliseconds."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def report(name: str, durations: list) -> None:
+    """Print median and p95 of durations."""
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name:<28} median {statistics.median(ordered):9.2f} ms   p95 {p95:9.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    matrix = CandidateMatrix(synthetic_rows(args.events, now), time.monotonic())
+    print(f"CandidateMatrix with {len(matrix)} events built in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    rng = np.random.default_rng(7)
+    affinity = rng.dirichlet(np.ones(len(matrix.categories))).astype(np.float32)
+    friends = rng.poisson(0.2, len(matrix)).astype(np.float32)
+    excluded = rng.random(len(matrix)) < 0.001
+    now_ts = _timestamp(now)
+
+    report("score_candidates (numpy)", timed(
+        lambda: score_candidates(matrix, affinity, friends, excluded, now_ts, args.limit), args.repeat
+    ))
+    report("python loop (reference)", timed(
+        lambda: python_loop_scores(matrix, affinity, friends, now_ts, args.limit), max(1, args.repeat // 25)
+    ))
+
+
+if __name__ == "__main__":
+    main()
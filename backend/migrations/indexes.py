@@ -0,0 +1,45 @@
+from typing import List, Optional
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def _index_exists(name: str, table: str) -> Optional[bool]:
+    """Whether the index exists, or None if its table does not.
+
+    Callers skip this in offline --sql mode, which cannot inspect the
+    database, and always emit their statement there.
+    """
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return name in {index["name"] for index in inspector.get_indexes(table)}
+
+
+def create_index_if_missing(name: str, table: str, columns: List[str]) -> None:
+    """Add an index to an existing table without blocking writes where supported.
+
+    New databases get their tables and indexes from create_all at startup,
+    so a missing table or an existing index is left alone. PostgreSQL builds
+    the index CONCURRENTLY; MySQL/InnoDB builds secondary indexes online.
+    """
+    context = op.get_context()
+    if not context.as_sql and _index_exists(name, table) is not False:
+        return
+    if context.dialect.name == "postgresql":
+        with context.autocommit_block():
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+    else:
+        op.create_index(name, table, columns)
+
+
+def drop_index_if_exists(name: str, table: str) -> None:
+    """Drop an index added by create_index_if_missing."""
+    context = op.get_context()
+    if not context.as_sql and not _index_exists(name, table):
+        return
+    if context.dialect.name == "postgresql":
+        with context.autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    else:
+        op.drop_index(name, table_name=table)
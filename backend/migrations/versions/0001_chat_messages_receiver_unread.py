@@ -0,0 +1,20 @@
+"""Index unread messages by receiver for badge counts
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from migrations.indexes import create_index_if_missing, drop_index_if_exists
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_index_if_missing("ix_chat_messages_receiver_unread", "chat_messages", ["receiver_id", "is_read"])
+
+
+def downgrade() -> None:
+    drop_index_if_exists("ix_chat_messages_receiver_unread", "chat_messages")
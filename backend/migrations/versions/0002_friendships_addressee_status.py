@@ -0,0 +1,20 @@
+"""Index friendships by addressee and status for feed fan-out
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from migrations.indexes import create_index_if_missing, drop_index_if_exists
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_index_if_missing("ix_friendships_addressee_status", "friendships", ["addressee_id", "status"])
+
+
+def downgrade() -> None:
+    drop_index_if_exists("ix_friendships_addressee_status", "friendships")
@@ -0,0 +1,20 @@
+"""Index friendships by updated_at for friend graph sync
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from migrations.indexes import create_index_if_missing, drop_index_if_exists
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_index_if_missing("ix_friendships_updated_at", "friendships", ["updated_at"])
+
+
+def downgrade() -> None:
+    drop_index_if_exists("ix_friendships_updated_at", "friendships")
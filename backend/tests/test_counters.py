@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app import counters, friends, messages
+from app.friend_graph import FriendGraph
+from app.models import Base, User, UserCounter, Friendship
+from app.schemas import ChatMessageCreate, FriendshipCreate, FriendshipUpdate
+
+
+@pytest.fixture
+def Session(tmp_path, monkeypatch):
+    """Database with three users and an isolated friend graph."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    db.add_all([User(id=i, email=f"user{i}@example.com", hashed_password="x") for i in (1, 2, 3)])
+    db.commit()
+    db.close()
+    monkeypatch.setattr(friends, "friend_graph", FriendGraph())
+    yield Session
+    engine.dispose()
+
+
+def _call(Session, handler, as_user: int, **kwargs):
+    """Run a route handler as a user in its own session, like one request."""
+    db = Session()
+    try:
+        return asyncio.run(handler(current_user=db.get(User, as_user), db=db, **kwargs))
+    finally:
+        db.close()
+
+
+def _counter(Session, user_id: int) -> tuple:
+    """Return (unread_messages, pending_friend_requests) as stored."""
+    db = Session()
+    try:
+        counter = db.get(UserCounter, user_id)
+        return counter.unread_messages, counter.pending_friend_requests
+    finally:
+        db.close()
+
+
+def _badges(Session, user_id: int) -> tuple:
+    badges = _call(Session, counters.get_badges, user_id)
+    return badges.unread_messages, badges.pending_friend_requests
+
+
+def _send(Session, sender_id: int, receiver_id: int) -> None:
+    _call(Session, messages.send_message, sender_id,
+          message_data=ChatMessageCreate(receiver_id=receiver_id, content="hi"))
+
+
+def _request(Session, requester_id: int, addressee_id: int) -> int:
+    return _call(Session, friends.send_friend_request, requester_id,
+                 request_data=FriendshipCreate(addressee_id=addressee_id)).id
+
+
+def _respond(Session, user_id: int, friendship_id: int, new_status: str):
+    return _call(Session, friends.respond_to_friend_request, user_id,
+                 friendship_id=friendship_id, response_data=FriendshipUpdate(status=new_status))
+
+
+def test_counters_follow_messages(Session):
+    _send(Session, 2, 1)
+    assert _counter(Session, 1) == (1, 0)
+    _send(Session, 2, 1)
+    _send(Session, 3, 1)
+    assert _counter(Session, 1) == (3, 0)
+
+    _call(Session, messages.mark_conversation_read, 1, user_id=2)
+    assert _counter(Session, 1) == (1, 0)
+    _call(Session, messages.mark_conversation_read, 1, user_id=2)
+    assert _counter(Session, 1) == (1, 0)
+    _call(Session, messages.mark_conversation_read, 1, user_id=3)
+    assert _badges(Session, 1) == (0, 0)
+
+
+def test_counters_follow_friend_requests(Session):
+    from_2 = _request(Session, 2, 1)
+    assert _counter(Session, 1) == (0, 1)
+    from_3 = _request(Session, 3, 1)
+    assert _counter(Session, 1) == (0, 2)
+
+    _respond(Session, 1, from_2, "accepted")
+    assert _counter(Session, 1) == (0, 1)
+    _respond(Session, 1, from_3, "declined")
+    assert _counter(Session, 1) == (0, 0)
+
+    # Blocking an accepted friend does not touch the pending count again
+    _respond(Session, 1, from_2, "blocked")
+    assert _badges(Session, 1) == (0, 0)
+
+
+def test_concurrent_responses_decrement_once(Session):
+    friendship_id = _request(Session, 2, 1)
+
+    # A second request read the friendship as pending before the first committed
+    stale = Session()
+    stale_friendship = stale.get(Friendship, friendship_id)
+    assert stale_friendship.status == "pending"
+    _respond(Session, 1, friendship_id, "accepted")
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(friends.respond_to_friend_request(
+            friendship_id=friendship_id,
+            response_data=FriendshipUpdate(status="declined"),
+            current_user=stale.get(User, 1),
+            db=stale
+        ))
+    stale.close()
+
+    assert exc.value.status_code == 409
+    assert _counter(Session, 1) == (0, 0)
+
+
+def test_seed_conflict_applies_delta_to_existing_row(Session, monkeypatch):
+    # Another transaction creates the row between the failed update and the seed
+    apply_deltas = counters._apply_deltas
+    calls = []
+
+    def racing(db, user_id, unread_messages, pending_friend_requests):
+        calls.append(user_id)
+        if len(calls) == 1:
+            db.execute(insert(UserCounter).values(user_id=user_id, unread_messages=0, pending_friend_requests=0))
+            return 0
+        return apply_deltas(db, user_id, unread_messages, pending_friend_requests)
+
+    monkeypatch.setattr(counters, "_apply_deltas", racing)
+    _send(Session, 2, 1)
+
+    assert len(calls) == 2
+    assert _counter(Session, 1) == (1, 0)
+
+
+def test_reconcile_repairs_drift(Session):
+    _send(Session, 2, 1)
+    _request(Session, 3, 1)
+    _send(Session, 1, 2)
+    db = Session()
+    db.execute(update(UserCounter).where(UserCounter.user_id == 1).values(
+        unread_messages=7, pending_friend_requests=-2
+    ))
+    db.query(UserCounter).filter(UserCounter.user_id == 2).delete()
+    db.commit()
+
+    assert counters.reconcile_counters(db) == 3
+    assert counters.reconcile_counters(db) == 0
+    db.close()
+
+    assert _counter(Session, 1) == (1, 1)
+    assert _counter(Session, 2) == (1, 0)
+    assert _counter(Session, 3) == (0, 0)
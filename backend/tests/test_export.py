@@ -0,0 +1,72 @@
+import json
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import export
+from app.models import Base, User, ChatMessage
+
+SMALL = 2_000
+LARGE = 100 * SMALL
+
+
+def _seed(path, messages: int) -> sessionmaker:
+    """Create a database with one user who received `messages` messages."""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    try:
+        db.add_all([
+            User(id=1, email="export@example.com", hashed_password="secret-hash"),
+            User(id=2, email="sender@example.com", hashed_password="secret-hash"),
+        ])
+        db.commit()
+        now = datetime.utcnow()
+        batch = 10_000
+        for start in range(0, messages, batch):
+            db.execute(insert(ChatMessage), [
+                {"sender_id": 2, "receiver_id": 1, "content": f"message {i}", "created_at": now}
+                for i in range(start, min(start + batch, messages))
+            ])
+        db.commit()
+    finally:
+        db.close()
+    return Session
+
+
+def _export_peak(monkeypatch, Session) -> tuple:
+    """Drain the export without keeping lines and return (lines, peak bytes)."""
+    monkeypatch.setattr(export, "SessionLocal", Session)
+    lines = 0
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in export.export_user_data(1):
+            lines += 1
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return lines, peak - baseline
+
+
+def test_export_lines_are_valid_ndjson_without_password(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "SessionLocal", _seed(tmp_path / "app.db", 10))
+    records = [json.loads(line) for line in export.export_user_data(1)]
+
+    assert [r["type"] for r in records] == ["profile"] + ["message"] * 10
+    assert records[0]["data"]["email"] == "export@example.com"
+    assert all("hashed_password" not in r["data"] for r in records)
+
+
+def test_export_memory_does_not_grow_with_rows(tmp_path, monkeypatch):
+    small_lines, small_peak = _export_peak(monkeypatch, _seed(tmp_path / "small.db", SMALL))
+    large_lines, large_peak = _export_peak(monkeypatch, _seed(tmp_path / "large.db", LARGE))
+
+    assert small_lines == SMALL + 1
+    assert large_lines == LARGE + 1
+    # 100x the rows must not mean noticeably more memory
+    assert large_peak < 2 * small_peak, (small_peak, large_peak)
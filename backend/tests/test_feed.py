@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from app import feed
+from app.models import Base, User, Event, Friendship
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Session on a database where users 1 and 2 are friends and 3 is not."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    session.add_all([User(id=i, email=f"user{i}@example.com", hashed_password="x") for i in (1, 2, 3)])
+    session.add(Friendship(id=1, requester_id=1, addressee_id=2, status="accepted"))
+    session.add(Event(id=1, title="Party", event_date=datetime.utcnow() + timedelta(days=1), creator_id=2))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _feed(db, user_id: int) -> list:
+    return [(a.actor_id, a.verb) for a in feed.read_feed(db, user_id, None, 20)]
+
+
+@pytest.mark.parametrize("fan_out_limit", [1000, 0], ids=["pushed", "pulled"])
+def test_feed_drops_activities_when_friendship_ends(db, monkeypatch, fan_out_limit):
+    monkeypatch.setattr(feed, "FEED_FANOUT_MAX_FRIENDS", fan_out_limit)
+    feed.record_activity(db, 2, "event_created", 1)
+    feed.record_activity(db, 1, "rsvp", 1)
+    db.commit()
+
+    assert _feed(db, 1) == [(2, "event_created")]
+    assert _feed(db, 2) == [(1, "rsvp")]
+    assert _feed(db, 3) == []
+
+    db.execute(update(Friendship).where(Friendship.id == 1).values(status="blocked"))
+    db.commit()
+
+    assert _feed(db, 1) == []
+    assert _feed(db, 2) == []
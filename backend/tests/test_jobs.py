@@ -0,0 +1,148 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from app import jobs
+from app.jobs import Job, JobQueue, enqueue
+
+
+@pytest.fixture
+def queue_db(tmp_path, monkeypatch):
+    """Point the job queue at an empty SQLite file and return its session factory."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(jobs, "job_engine", engine)
+    monkeypatch.setattr(jobs, "JobSession", Session)
+    monkeypatch.setattr(jobs, "_schema_ready", False)
+    monkeypatch.setattr(jobs, "JOB_QUEUE_ENABLED", True)
+    yield Session
+    engine.dispose()
+
+
+def _get(Session, job_id: int) -> Job:
+    db = Session()
+    try:
+        return db.get(Job, job_id)
+    finally:
+        db.close()
+
+
+def _make_due(Session, job_id: int) -> None:
+    """Skip the backoff delay of a queued job."""
+    db = Session()
+    try:
+        db.execute(update(Job).where(Job.id == job_id).values(run_after=datetime.utcnow()))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_idempotency_key_deduplicates(queue_db):
+    first = enqueue("tests.noop", {"n": 1}, idempotency_key="same-key")
+    second = enqueue("tests.noop", {"n": 2}, idempotency_key="same-key")
+    other = enqueue("tests.noop", {"n": 3}, idempotency_key="other-key")
+
+    assert first == second
+    assert other != first
+    db = queue_db()
+    try:
+        assert db.query(Job).count() == 2
+    finally:
+        db.close()
+
+
+def test_disabled_queue_stores_nothing(queue_db, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_QUEUE_ENABLED", False)
+    assert enqueue("tests.noop") is None
+
+    jobs._ensure_schema()
+    db = queue_db()
+    try:
+        assert db.query(Job).count() == 0
+    finally:
+        db.close()
+
+
+def test_failing_job_backs_off_then_fails(queue_db, monkeypatch):
+    calls = []
+
+    def flaky(payload):
+        calls.append(payload)
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(jobs._handlers, "tests.flaky", flaky)
+    job_id = enqueue("tests.flaky", {"n": 1}, max_attempts=3)
+    queue = JobQueue()
+
+    for attempt in range(1, 4):
+        claimed = queue._claim()
+        assert claimed is not None and claimed.attempts == attempt
+        before = datetime.utcnow()
+        asyncio.run(queue._run(claimed))
+        stored = _get(queue_db, job_id)
+        if attempt < 3:
+            # Exponential backoff with jitter between half and full delay
+            delay = jobs.JOB_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)
+            assert stored.status == "queued"
+            assert before + timedelta(seconds=delay * 0.5 - 0.1) <= stored.run_after
+            assert stored.run_after <= datetime.utcnow() + timedelta(seconds=delay)
+            assert queue._claim() is None
+            _make_due(queue_db, job_id)
+
+    assert len(calls) == 3
+    assert stored.status == "failed"
+    assert stored.last_error == "RuntimeError: boom"
+    assert queue._claim() is None
+
+
+def test_stale_lease_is_reclaimed(queue_db):
+    job_id = enqueue("tests.noop")
+    crashed = JobQueue()
+    crashed.worker_id = "crashed"
+    assert crashed._claim().id == job_id
+
+    survivor = JobQueue()
+    survivor.worker_id = "survivor"
+    assert survivor._claim() is None
+
+    db = queue_db()
+    try:
+        stale = datetime.utcnow() - timedelta(seconds=jobs.JOB_LEASE_SECONDS + 1)
+        db.execute(update(Job).where(Job.id == job_id).values(started_at=stale))
+        db.commit()
+    finally:
+        db.close()
+
+    reclaimed = survivor._claim()
+    assert reclaimed.id == job_id
+    assert reclaimed.attempts == 2
+    assert reclaimed.locked_by == "survivor"
+
+
+def test_unknown_handler_fails_permanently(queue_db):
+    job_id = enqueue("tests.unregistered", max_attempts=5)
+    queue = JobQueue()
+
+    asyncio.run(queue._run(queue._claim()))
+
+    stored = _get(queue_db, job_id)
+    assert stored.status == "failed"
+    assert stored.attempts == 1
+    assert "No handler registered" in stored.last_error
+    _make_due(queue_db, job_id)
+    assert queue._claim() is None
+
+
+def test_successful_job_is_done(queue_db, monkeypatch):
+    seen = []
+    monkeypatch.setitem(jobs._handlers, "tests.record", seen.append)
+    job_id = enqueue("tests.record", {"user_id": 7})
+    queue = JobQueue()
+
+    asyncio.run(queue._run(queue._claim()))
+
+    assert seen == [{"user_id": 7}]
+    assert _get(queue_db, job_id).status == "done"